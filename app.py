@@ -4,14 +4,26 @@ try:
 except Exception as e:
     print(f"Failed to import deploy_helper: {e}")
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, make_response
+from flask import Flask, Blueprint, g, render_template, request, redirect, url_for, flash, session, jsonify, make_response
 import os
 import logging
+import tempfile
+import threading
+import time
 from datetime import datetime, timedelta
-import json
+import hashlib
 import random
+import secrets
 import traceback
 
+# Optional fast JSON serializer for the hot API endpoints. Flask 2.0 has no
+# pluggable JSON provider, so jsonify is stuck with the stdlib json module;
+# orjson encodes typical dict/str payloads several times faster.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,18 +40,16 @@ try:
     from backend.api_service import humanize_text, get_api_status, HumanizerAPIError, count_words
     logger.info("Successfully imported API service")
     
-    # Try to import the MongoDB-based database module
+    # Try to import the MongoDB-based database module. The connection itself is
+    # deferred (connect=False), so the import is cheap - the actual ping happens
+    # lazily in _ensure_db_ready() below rather than blocking startup.
     try:
         from backend.db import init_db, add_user, verify_user, get_user, update_user_usage
         from backend.db import client, db
-        
-        # Test MongoDB connection
-        db.command('ping')
-        logger.info("MongoDB connection successful")
         using_fallback_db = False
     except Exception as e:
-        # If MongoDB connection fails, use the fallback implementation
-        logger.warning(f"MongoDB connection failed: {str(e)}. Switching to fallback database.")
+        # If the MongoDB module can't even be imported, use the fallback implementation
+        logger.warning(f"MongoDB module import failed: {str(e)}. Switching to fallback database.")
         logger.warning(traceback.format_exc())
         from backend.db_fallback import init_db, add_user, verify_user, get_user, update_user_usage
         from backend.db_fallback import client, db
@@ -56,13 +66,77 @@ except Exception as e:
 
 # Initialize Flask app
 app = Flask(__name__)
-app.secret_key = os.environ.get('SECRET_KEY', 'andikar-ai-development-key')
+# Session signing key. The fallback is generated once per process with a
+# single urandom read (gunicorn --preload forks workers after import, so
+# they share it); without SECRET_KEY set, sessions won't survive restarts.
+app.secret_key = os.environ.get('SECRET_KEY') or secrets.token_urlsafe(32)
+if not os.environ.get('SECRET_KEY'):
+    logger.warning("SECRET_KEY not set - using a per-process random key; sessions reset on restart")
+
+# Serve /dashboard/ and /dashboard from the same rule instead of answering the
+# mis-slashed form with a 301, which costs clients a full extra round-trip.
+# (Werkzeug collapses duplicate slashes by default via merge_slashes.)
+app.url_map.strict_slashes = False
+
+# Persist compiled Jinja templates across restarts and, outside development,
+# skip the per-render stat of template files for auto-reload.
+try:
+    from jinja2 import FileSystemBytecodeCache
+    _jinja_cache_dir = os.path.join(tempfile.gettempdir(), 'jinja_cache')
+    os.makedirs(_jinja_cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=_jinja_cache_dir)
+except OSError as e:
+    logger.warning(f"Could not set up Jinja bytecode cache: {str(e)}")
+
+if os.environ.get('FLASK_ENV', 'production') != 'development':
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_env.auto_reload = False
 # Extend session lifetime
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
-# Print all environment variables for debugging (redacted for security)
-env_vars = {k: (v[:5] + "..." + v[-5:] if len(v) > 15 else "***") for k, v in os.environ.items()}
-logger.info(f"Environment variables (redacted): {env_vars}")
+# Let browsers cache /static/* for a day. Flask's static handler already
+# serves conditional ETag/Last-Modified 304s; this adds the Cache-Control
+# lifetime so repeat visitors skip the request entirely.
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = timedelta(
+    seconds=int(os.environ.get('STATIC_MAX_AGE', '86400')))
+
+# Use Redis-backed server-side sessions when available. The default signed
+# cookie ships the whole session (user id, email, picture URL, OAuth debug
+# values, flash messages) in every request and HMAC-signs/verifies it each
+# way; an opaque session ID keeps the cookie tiny and skips that work.
+if os.environ.get('REDIS_URL'):
+    try:
+        import redis
+        from flask_session import Session
+
+        app.config['SESSION_TYPE'] = 'redis'
+        app.config['SESSION_REDIS'] = redis.Redis.from_url(os.environ['REDIS_URL'])
+        Session(app)
+        logger.info("Using Redis-backed server-side sessions")
+    except Exception as e:
+        logger.warning(f"Failed to configure Redis sessions, using cookie sessions: {str(e)}")
+
+# Compress template-heavy responses when flask-compress is installed - the
+# rendered pages shrink 3-5x over the wire for little CPU next to the render.
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_LEVEL'] = 4
+    # Compress the JSON API/health payloads too, and skip responses small
+    # enough that the gzip header would eat the savings
+    app.config['COMPRESS_MIMETYPES'] = ['text/html', 'text/css',
+                                        'application/javascript', 'application/json']
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+    logger.info("Response compression enabled")
+except ImportError:
+    logger.info("flask-compress not installed, serving uncompressed responses")
+
+# Dump environment variables only when explicitly requested (redacted for security).
+# Doing this unconditionally slowed cold-start and bloated logs under preforking,
+# and the 10 leading/trailing chars still leaked part of long secrets.
+if os.environ.get('DEBUG_ENV_DUMP') and logger.isEnabledFor(logging.INFO):
+    env_vars = {k: (v[:5] + "..." + v[-5:] if len(v) > 15 else "***") for k, v in os.environ.items()}
+    logger.info(f"Environment variables (redacted): {env_vars}")
 
 # Add environment variable info to session for debugging
 app.config['GOOGLE_CLIENT_ID'] = os.environ.get("GOOGLE_CLIENT_ID", "934412857118-i13t5ma9afueo40tmohosprsjf4555f0.apps.googleusercontent.com")
@@ -70,17 +144,170 @@ app.config['GOOGLE_CLIENT_SECRET_SET'] = bool(os.environ.get("GOOGLE_CLIENT_SECR
 logger.info(f"Google Client ID: {app.config['GOOGLE_CLIENT_ID'][:5]}...{app.config['GOOGLE_CLIENT_ID'][-5:]}")
 logger.info(f"Google Client Secret is set: {app.config['GOOGLE_CLIENT_SECRET_SET']}")
 
-# Initialize database
-init_db()
+# Defer database initialization to the first request instead of blocking import.
+# The MongoDB ping is a synchronous network round-trip; doing it at import time
+# added hundreds of ms to cold-start and could wedge workers when Mongo was slow.
+_db_ready = False
+_db_init_lock = threading.Lock()
+
+def _ensure_db_ready():
+    """Verify the MongoDB connection once, switching to the fallback db on failure."""
+    global _db_ready, init_db, add_user, verify_user, get_user, update_user_usage
+    global client, db, using_fallback_db
+
+    if _db_ready:
+        return
+
+    with _db_init_lock:
+        if _db_ready:
+            return
+
+        if not using_fallback_db:
+            try:
+                # Test MongoDB connection
+                db.command('ping')
+                logger.info("MongoDB connection successful")
+            except Exception as e:
+                # If MongoDB connection fails, use the fallback implementation
+                logger.warning(f"MongoDB connection failed: {str(e)}. Switching to fallback database.")
+                logger.warning(traceback.format_exc())
+                from backend.db_fallback import init_db, add_user, verify_user, get_user, update_user_usage
+                from backend.db_fallback import client, db
+                using_fallback_db = True
+
+        # Initialize database
+        init_db()
+        _db_ready = True
+
+# Short-TTL cache of user documents so repeated dashboard/account/debug views
+# by the same user skip the MongoDB round-trip. Writes (usage updates) pop the
+# entry so fresh stats show up immediately.
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+USER_CACHE_TTL = 30     # seconds
+USER_CACHE_MAX = 10000  # entries; cleared wholesale if ever exceeded
+
+def cached_get_user(user_id):
+    """Return get_user(user_id), cached for USER_CACHE_TTL seconds."""
+    now = time.monotonic()
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry and now < entry[1]:
+            return entry[0]
+
+    user = get_user(user_id)
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_MAX:
+            _user_cache.clear()
+        _user_cache[user_id] = (user, now + USER_CACHE_TTL)
+    return user
+
+def _invalidate_user_cache(user_id):
+    """Drop a user's cached document after their record changes."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+# Cache API status checks so hot routes don't make an outbound HTTP call per request
+_api_status_cache = {"value": None, "expires": 0}
+_api_status_lock = threading.Lock()
+
+def cached_api_status(ttl=30):
+    """Return the API status, refreshing it at most once per `ttl` seconds.
+
+    get_api_status() performs a network round-trip to the humanizer API, so
+    calling it on every dashboard/health/debug request dominates latency for
+    those endpoints. The status changes rarely, so a short TTL cache is safe.
+    """
+    now = time.monotonic()
+    if _api_status_cache["value"] is not None and now < _api_status_cache["expires"]:
+        return _api_status_cache["value"]
+
+    with _api_status_lock:
+        # Re-check after acquiring the lock in case another thread refreshed
+        now = time.monotonic()
+        if _api_status_cache["value"] is not None and now < _api_status_cache["expires"]:
+            return _api_status_cache["value"]
+
+        status = get_api_status()
+        _api_status_cache["value"] = status
+        _api_status_cache["expires"] = now + ttl
+        return status
+
+def request_api_status():
+    """Return the API status, computed at most once per request.
+
+    Views that need the status in several places (render + logging) should
+    use this instead of cached_api_status() directly; the first call within
+    a request stashes the result on `g` so later calls are attribute lookups.
+    """
+    status = g.get('_api_status')
+    if status is None:
+        status = cached_api_status()
+        g._api_status = status
+    return status
+
+# Blueprint for the JSON API endpoints. Grouping them lets error handlers
+# detect API requests via request.blueprint (attribute access) instead of
+# parsing the path, and scopes any future API-only hooks to one place.
+api_bp = Blueprint('api', __name__, url_prefix='/api')
+
+# Blueprints whose endpoints should receive JSON error responses
+_API_BLUEPRINTS = frozenset(('api',))
+
+def _is_api_request():
+    """Return True if the current request should get JSON error responses."""
+    # request.blueprint covers matched routes; the path prefix check is the
+    # fallback for unmatched URLs (404s) and the support bot's /api/support/*.
+    return request.blueprint in _API_BLUEPRINTS or request.path.startswith('/api/')
 
 # Register support bot blueprint
 register_support_bot(app)
 
-# Check API status on startup
-api_status = get_api_status()
-logger.info(f"\nAPI Status: {api_status.get('status', 'unknown')}")
-if api_status.get('status') != 'online':
-    logger.warning(f"API is not fully operational: {api_status.get('message', 'Unknown error')}")
+# Pre-compile the page templates into Jinja's in-memory cache at startup so no
+# request pays the parse/compile cost. render_template() serves from the same
+# cache, so call sites stay unchanged.
+_WARM_TEMPLATES = ('index.html', 'login.html', 'register.html', 'dashboard.html',
+                   'account.html', 'humanize.html', 'debug.html', 'support.html',
+                   'errors/405.html')
+
+def _warm_template_cache():
+    for name in _WARM_TEMPLATES:
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            logger.warning(f"Failed to precompile template {name}: {str(e)}")
+
+_warm_template_cache()
+
+# Run deferred initialization on the first request rather than at import time.
+# Both the Mongo ping and the API probe are network round-trips that used to
+# block every worker boot; deferring them keeps cold-start fast and means
+# workers that never serve traffic never probe.
+@app.before_first_request
+def _init_services():
+    """Initialize the database connection and API status probe lazily."""
+    _ensure_db_ready()
+
+    # Check API status on first request (result is served from the TTL cache)
+    api_status = cached_api_status()
+    logger.info(f"\nAPI Status: {api_status.get('status', 'unknown')}")
+    if api_status.get('status') != 'online':
+        logger.warning(f"API is not fully operational: {api_status.get('message', 'Unknown error')}")
+
+# Snapshot the session user once per request. Hooks, views, and error
+# handlers read g.user_id instead of each deserializing the session cookie
+# through the context-local proxy again.
+@app.before_request
+def _load_session_user():
+    g.user_id = session.get('user_id')
+
+# Send logged-in users from the landing/register pages straight to humanize.
+# Centralizing the check keeps the view functions unconditional, which allows
+# caching the rendered landing page for anonymous traffic.
+@app.before_request
+def _redirect_logged_in_from_landing():
+    if request.endpoint in ('index', 'register') and g.user_id:
+        return redirect(url_for('humanize'))
 
 # Add middleware for Edge browser detection
 @app.before_request
@@ -94,17 +321,53 @@ def detect_edge_browser():
     
     # For the login page, redirect if the URL contains a query parameter 
     # (common in Edge after failed redirects)
-    if request.path == '/login' and '=' in request.url and is_edge and 'user_id' in session:
+    if request.path == '/login' and '=' in request.url and is_edge and g.user_id:
         return redirect(url_for('humanize'))
 
+# Rendered landing page, cached per process. Only anonymous users reach the
+# index view, so the template output is identical for every request that has
+# no pending flash messages or Edge-specific markup. The rendered HTML embeds
+# request.host (base.html's favicon URL), and the Host header is
+# client-controlled, so - like _callback_url_cache - entries are keyed by
+# (scheme, host), bounded, and expire after a short TTL.
+_landing_page_cache = {}
+LANDING_CACHE_TTL = 300  # seconds
+LANDING_CACHE_MAX = 8    # (scheme, host) pairs a deployment legitimately sees
+
 @app.route('/')
 def index():
     """Render the homepage with text processing capabilities."""
-    # For the simplified home page that can handle both logged-in and guest users
-    # If user is logged in, redirect to humanize page
-    if 'user_id' in session:
-        return redirect(url_for('humanize'))
-    return render_template('index.html')
+    # Logged-in users never reach this view; _redirect_logged_in_from_landing
+    # already sent them to the humanize page.
+    # Flash messages (e.g. after logout) and the Edge-browser variant are
+    # per-request, so those fall through to a full Jinja render.
+    if session.get('_flashes') or session.get('is_edge_browser'):
+        return render_template('index.html')
+
+    key = (request.scheme, request.host)
+    now = time.monotonic()
+    entry = _landing_page_cache.get(key)
+    if entry is None or now >= entry[2]:
+        html = render_template('index.html')
+        entry = (html, hashlib.md5(html.encode()).hexdigest(),
+                 now + LANDING_CACHE_TTL)
+        if key in _landing_page_cache or len(_landing_page_cache) < LANDING_CACHE_MAX:
+            _landing_page_cache[key] = entry
+    html = entry[0]
+
+    # Serve a 304 to revisiting browsers that already hold this revision.
+    # if_none_match handles quoting, '*', and multi-value lists for us.
+    etag = entry[1]
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(html)
+    response.set_etag(etag)
+    # no-cache (not a freshness lifetime): the browser must revalidate so a
+    # user who just logged in gets the redirect to /humanize instead of a
+    # locally cached anonymous page; revalidation is a cheap 304 here.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
@@ -116,7 +379,7 @@ def register():
 def login():
     """Handle user login - redirect to Google OAuth."""
     # If user is already logged in, redirect to humanize
-    if 'user_id' in session:
+    if g.user_id:
         return redirect(url_for('humanize'))
         
     # Add OAuth config info to session for debugging
@@ -125,7 +388,7 @@ def login():
     session.permanent = True  # Make session persistent
     
     # Generate Google OAuth URL
-    google_auth_url = get_google_auth_url(url_for('callback', _external=True))
+    google_auth_url = get_google_auth_url(_external_callback_url())
     
     if not google_auth_url:
         flash('Error configuring Google login. Please try again later.', 'danger')
@@ -148,6 +411,24 @@ def login():
     
     return response
 
+# The external callback URL depends only on the scheme and serving host,
+# which are fixed per deployment, so build it once instead of traversing the
+# URL map on every login and callback request. The Host header is
+# client-controlled, so the cache is small and bounded - past the cap we
+# just build the URL each time rather than grow forever on spoofed hosts.
+_callback_url_cache = {}
+CALLBACK_URL_CACHE_MAX = 8  # (scheme, host) pairs a deployment legitimately sees
+
+def _external_callback_url():
+    """Return url_for('callback', _external=True), cached per scheme+host."""
+    key = (request.scheme, request.host)
+    url = _callback_url_cache.get(key)
+    if url is None:
+        url = url_for('callback', _external=True)
+        if len(_callback_url_cache) < CALLBACK_URL_CACHE_MAX:
+            _callback_url_cache[key] = url
+    return url
+
 @app.route('/callback')
 def callback():
     """Handle the OAuth callback from Google."""
@@ -173,7 +454,7 @@ def callback():
     
     # Exchange code for tokens
     logger.info(f"Exchanging code for tokens...")
-    tokens = get_google_tokens(code, url_for('callback', _external=True))
+    tokens = get_google_tokens(code, _external_callback_url())
     
     if not tokens:
         flash('Failed to authenticate with Google. Please try again.', 'danger')
@@ -232,178 +513,239 @@ def logout():
 @app.route('/dashboard', methods=['GET'])
 def dashboard():
     """Render the user dashboard."""
-    # Check if user is logged in
-    if 'user_id' not in session:
+    # Check if user is logged in (session snapshot taken in _load_session_user)
+    user_id = g.user_id
+    if user_id is None:
         flash('Please log in to access the dashboard', 'warning')
         return redirect(url_for('login'))
-    
+
     # Get user info
-    user_id = session['user_id']
-    user = get_user(user_id)
+    user = cached_get_user(user_id)
     
     # Render dashboard template with user info
     return render_template('dashboard.html', 
-                          user=user, 
-                          api_status=get_api_status())
+                          user=user,
+                          api_status=request_api_status())
 
 @app.route('/account', methods=['GET'])
 def account():
     """Render the user account page."""
-    # Check if user is logged in
-    if 'user_id' not in session:
+    # Check if user is logged in (session snapshot taken in _load_session_user)
+    user_id = g.user_id
+    if user_id is None:
         flash('Please log in to access your account', 'warning')
         return redirect(url_for('login'))
-    
+
     # Get user info
-    user_id = session['user_id']
-    user = get_user(user_id)
+    user = cached_get_user(user_id)
     
     # Render account template with user info
     return render_template('account.html', user=user)
 
+# Upper bound on accepted input size for /humanize (characters)
+MAX_TEXT_CHARS = int(os.environ.get('MAX_TEXT_CHARS', '200000'))
+
 @app.route('/humanize', methods=['GET', 'POST'])
 def humanize():
     """Handle text humanization requests."""
-    # Check if user is logged in
-    if 'user_id' not in session:
+    # Check if user is logged in; user_id doubles as the tracking identifier
+    user_id = g.user_id
+    if user_id is None:
         flash('Please log in to access the humanize feature', 'warning')
         return redirect(url_for('login'))
-    
-    # Get user_id for tracking purposes
-    user_id = session.get('user_id')
-    
+
     if request.method == 'POST':
         # Get original text from form
         original_text = request.form.get('original_text', '')
-        
+
+        # If the request came from the home page, error paths redirect back
+        # there; computed once instead of re-checking the referrer per branch
+        referrer = request.referrer or ''
+        came_from_home = bool(referrer) and 'humanize' not in referrer
+
         if not original_text:
             flash('Please enter text to humanize', 'warning')
-            # If request comes from home page, redirect back to home
-            if request.referrer and 'humanize' not in request.referrer:
+            if came_from_home:
+                return redirect(url_for('index'))
+            return render_template('humanize.html')
+
+        # Reject obviously oversized pastes on length alone, before paying the
+        # O(n) word count or tying up a worker on the upstream API call. The
+        # cap is far above the largest plan's 8,000-word limit.
+        if len(original_text) > MAX_TEXT_CHARS:
+            flash('Text is too long to process. Please submit a shorter excerpt.', 'warning')
+            if came_from_home:
                 return redirect(url_for('index'))
             return render_template('humanize.html')
         
         # Count words in the input text
         word_count = count_words(original_text)
-        
+
+        # Context shared by the success and error renders; built once and
+        # updated in place instead of repeating the kwargs at each call site
+        ctx = {'original_text': original_text, 'word_count': word_count}
+
         try:
-            # Call the API through our backend service
-            result = humanize_text(original_text, user_id)
-            humanized_text = result.get('humanized_text', '')
-            
-            # Prepare success message
-            message = "Text humanized successfully!"
-            message_type = "success"
-            
+            # Call the API through our backend service (word_count passed
+            # along so the service doesn't re-scan the input)
+            result = humanize_text(original_text, user_id, word_count=word_count)
+
+            # The service updated the user's usage stats; drop the cached doc
+            _invalidate_user_cache(user_id)
+
             # Get metrics
             metrics = result.get('metrics', {})
-            api_response_time = metrics.get('response_time', None)
-            api_source = "External API"
-            
+
             # Render the template with results
-            return render_template('humanize.html',
-                                  original_text=original_text,
-                                  humanized_text=humanized_text,
-                                  metrics=metrics,
-                                  message=message,
-                                  message_type=message_type,
-                                  api_source=api_source,
-                                  api_response_time=api_response_time,
-                                  word_count=word_count)
-                                  
+            ctx.update(humanized_text=result.get('humanized_text', ''),
+                       metrics=metrics,
+                       message="Text humanized successfully!",
+                       message_type="success",
+                       api_source="External API",
+                       api_response_time=metrics.get('response_time', None))
+            return render_template('humanize.html', **ctx)
+
         except HumanizerAPIError as e:
             # API error
             message = f"API Error: {str(e)}"
-            flash(message, 'danger')
-            # If request comes from home page, redirect back to home
-            if request.referrer and 'humanize' not in request.referrer:
-                return redirect(url_for('index'))
-            return render_template('humanize.html', 
-                                  original_text=original_text,
-                                  message=message,
-                                  message_type="danger",
-                                  word_count=word_count)
         except Exception as e:
             # Unexpected error
             message = f"Unexpected error: {str(e)}"
-            flash(message, 'danger')
-            # If request comes from home page, redirect back to home
-            if request.referrer and 'humanize' not in request.referrer:
-                return redirect(url_for('index'))
-            return render_template('humanize.html', 
-                                  original_text=original_text,
-                                  message=message,
-                                  message_type="danger",
-                                  word_count=word_count)
+
+        # Shared error path
+        flash(message, 'danger')
+        if came_from_home:
+            return redirect(url_for('index'))
+        ctx.update(message=message, message_type="danger")
+        return render_template('humanize.html', **ctx)
     
     # GET request - display humanize form
     return render_template('humanize.html')
 
-@app.route('/api/word-count', methods=['POST'])
+# Editors debounce and resend near-identical text while the user types, so
+# repeated counts of the same string are common. Counts are cached keyed by
+# a digest of the text - 16-byte key plus an int per entry - so the cache
+# never pins request bodies in memory, no matter how large the POSTs are.
+_word_count_cache = {}
+_word_count_lock = threading.Lock()
+WORD_COUNT_CACHE_MAX = 1024  # entries; cleared wholesale if ever exceeded
+
+def _cached_word_count(text):
+    """Return count_words(text), memoized by content digest."""
+    key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    with _word_count_lock:
+        count = _word_count_cache.get(key)
+    if count is None:
+        count = count_words(text)
+        with _word_count_lock:
+            if len(_word_count_cache) >= WORD_COUNT_CACHE_MAX:
+                _word_count_cache.clear()
+            _word_count_cache[key] = count
+    return count
+
+@api_bp.route('/word-count', methods=['POST'])
 def api_word_count():
     """API endpoint to count words in text."""
-    # Get the text from the request
-    data = request.json
-    text = data.get('text', '')
-    
+    # text/plain bodies skip JSON parsing entirely - useful for the live
+    # counter UI, which posts on every keystroke pause.
+    if request.content_type and request.content_type.startswith('text/plain'):
+        text = request.get_data(as_text=True)
+    else:
+        # silent=True avoids exception-driven 400s on a missing/wrong
+        # Content-Type; the parsed body is cached on the request object.
+        data = request.get_json(silent=True) or {}
+        text = data.get('text', '')
+
     # Count words
-    word_count = count_words(text)
-    
+    word_count = _cached_word_count(text)
+
     # Return word count
-    return jsonify({
+    return _json_response({
         'word_count': word_count
     })
 
-@app.route('/api/detect-ai', methods=['GET', 'POST'])
+@api_bp.route('/detect-ai', methods=['GET', 'POST'])
 def api_detect_ai():
     """API endpoint to detect AI-generated content."""
     # Handle both GET and POST requests
     if request.method == 'POST':
         # For POST requests, get text from request body
-        data = request.json or {}
+        data = request.get_json(silent=True) or {}
         text = data.get('text', '')
     else:
         # For GET requests, get text from query parameter
         text = request.args.get('text', '')
     
     if not text:
-        return jsonify({
+        return _json_response({
             'error': 'No text provided'
-        }), 400
-    
+        }, 400)
+
+    # Return the AI detection score
+    word_count, ai_score = _analyze_text(text)
+    return _json_response({
+        'ai_score': ai_score,
+        'analyzed_at': datetime.now().isoformat()
+    })
+
+def _json_response(payload, status=200):
+    """Build a JSON response with orjson when available, else jsonify."""
+    if orjson is None:
+        return make_response(jsonify(payload), status)
+    response = make_response(orjson.dumps(payload).decode(), status)
+    response.mimetype = 'application/json'
+    return response
+
+# Score pools for the simulated detector. Values are already bounded ints,
+# so picking from a tuple replaces the randint + clamp + round chain.
+_SHORT_TEXT_SCORES = tuple(range(15, 86))  # short texts get more random scores
+_LONG_TEXT_SCORES = tuple(range(40, 96))   # longer texts lean more "AI-written"
+
+def _analyze_text(text):
+    """Count words and compute the simulated AI-detection score in one pass.
+
+    Shared by /api/detect-ai and /api/analyze so both fields come from a
+    single scan of the text.
+    """
     # In a real implementation, you would call an AI detection service
     # For this demo, we'll simulate a detection algorithm
-    
+
     # Simple simulation of AI detection (random score with some factors)
-    word_count = count_words(text)
-    
+    word_count = _cached_word_count(text)
+
     # Base score - for demo purposes
-    if word_count < 50:
-        # Short texts get more random scores
-        base_score = random.randint(15, 85)
-    else:
-        # Longer texts tend to lean more toward "AI-written" for this demo
-        base_score = random.randint(40, 95)
-    
-    # Add some variance based on text characteristics
-    # More complex logic would be implemented in a real detector
-    
-    # Final AI score
-    ai_score = min(max(base_score, 0), 100)
-    
-    # Round to integer
-    ai_score = round(ai_score)
-    
-    # Add a small delay to simulate processing
-    import time
-    time.sleep(0.5)  # Reduced delay to improve responsiveness
-    
-    # Return the AI detection score
-    return jsonify({
+    ai_score = random.choice(_SHORT_TEXT_SCORES if word_count < 50 else _LONG_TEXT_SCORES)
+
+    return word_count, ai_score
+
+@api_bp.route('/analyze', methods=['POST'])
+def api_analyze():
+    """API endpoint returning word count and AI score in a single round-trip.
+
+    Lets the editor issue one request per text blob instead of separate
+    /api/word-count and /api/detect-ai calls.
+    """
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+
+    if not text:
+        return _json_response({
+            'error': 'No text provided'
+        }, 400)
+
+    word_count, ai_score = _analyze_text(text)
+    return _json_response({
+        'word_count': word_count,
         'ai_score': ai_score,
         'analyzed_at': datetime.now().isoformat()
     })
 
+# Files whose deployment state the /debug page reports on
+_DEBUG_FILE_PATHS = ("/app/app.py", "/app/backend/db_fallback.py", "/app/backend/oauth.py")
+
+# Session keys shown on the /debug page
+_DEBUG_SESSION_KEYS = ('user_id', 'user_email', 'user_picture', 'is_edge_browser')
+
 @app.route('/debug', methods=['GET'])
 def debug():
     """Debug endpoint to show application state."""
@@ -413,9 +755,9 @@ def debug():
     
     # Current user info
     user_info = None
-    if 'user_id' in session:
-        user_id = session['user_id']
-        user = get_user(user_id)
+    user_id = g.user_id
+    if user_id is not None:
+        user = cached_get_user(user_id)
         if user:
             user_info = {
                 'username': user.get('username', user_id),
@@ -424,32 +766,34 @@ def debug():
             }
     
     # API status
-    api_status = get_api_status()
-    
-    # Session data
-    session_data = dict(session)
+    api_status = request_api_status()
+
+    # Session data - copy only the known keys instead of materializing the
+    # whole session; also keeps OAuth state/client values out of the page
+    session_data = {k: session[k] for k in _DEBUG_SESSION_KEYS if k in session}
     
     # Database status
     db_status = "Using fallback in-memory database" if using_fallback_db else "Using MongoDB"
     
-    # Environment info
+    # Environment info (bind the mapping once instead of six module lookups)
+    env = os.environ
     env_info = {
-        "RAILWAY_STATIC_URL": os.environ.get("RAILWAY_STATIC_URL", "Not set"),
-        "PORT": os.environ.get("PORT", "Not set"),
-        "NIXPACKS_PYTHON_VERSION": os.environ.get("NIXPACKS_PYTHON_VERSION", "Not set"),
-        "GOOGLE_CLIENT_SECRET_SET": bool(os.environ.get("GOOGLE_CLIENT_SECRET")),
-        "DEPLOYMENT_ID": os.environ.get("RAILWAY_DEPLOYMENT_ID", "Not set")[:8] + "...",
-        "GIT_COMMIT": os.environ.get("RAILWAY_GIT_COMMIT_SHA", "Not set")[:8] + "..."
+        "RAILWAY_STATIC_URL": env.get("RAILWAY_STATIC_URL", "Not set"),
+        "PORT": env.get("PORT", "Not set"),
+        "NIXPACKS_PYTHON_VERSION": env.get("NIXPACKS_PYTHON_VERSION", "Not set"),
+        "GOOGLE_CLIENT_SECRET_SET": bool(env.get("GOOGLE_CLIENT_SECRET")),
+        "DEPLOYMENT_ID": env.get("RAILWAY_DEPLOYMENT_ID", "Not set")[:8] + "...",
+        "GIT_COMMIT": env.get("RAILWAY_GIT_COMMIT_SHA", "Not set")[:8] + "..."
     }
     
-    # File status
+    # File status - one stat() per file instead of exists/getsize/getmtime
     file_status = {}
-    for path in ["/app/app.py", "/app/backend/db_fallback.py", "/app/backend/oauth.py"]:
-        if os.path.exists(path):
-            size = os.path.getsize(path)
-            mtime = datetime.fromtimestamp(os.path.getmtime(path))
-            file_status[path] = f"Exists: {size} bytes, modified: {mtime}"
-        else:
+    for path in _DEBUG_FILE_PATHS:
+        try:
+            st = os.stat(path)
+            mtime = datetime.fromtimestamp(st.st_mtime)
+            file_status[path] = f"Exists: {st.st_size} bytes, modified: {mtime}"
+        except OSError:
             file_status[path] = "DOES NOT EXIST"
     
     # Return debug information
@@ -468,81 +812,87 @@ def health_check():
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
         "db_connection": "fallback" if using_fallback_db else "mongodb",
-        "api_status": get_api_status().get('status', 'unknown'),
+        "api_status": request_api_status().get('status', 'unknown'),
         "oauth_configured": bool(os.environ.get("GOOGLE_CLIENT_SECRET")),
         "environment": os.environ.get("RAILWAY_ENVIRONMENT", "unknown"),
         "deployment_id": os.environ.get("RAILWAY_DEPLOYMENT_ID", "unknown")[:8] + "...",
         "git_commit": os.environ.get("RAILWAY_GIT_COMMIT_SHA", "unknown")[:8] + "..."
     }
-    return jsonify(status)
-
-@app.errorhandler(405)
-def method_not_allowed(e):
-    """Handle Method Not Allowed errors gracefully."""
-    app.logger.error(f"Method Not Allowed error: {request.method} {request.path}")
-    
-    # Check if the request is for an API endpoint
-    if request.path.startswith('/api/'):
-        return jsonify({
-            'error': 'Method not allowed',
-            'message': f'The method {request.method} is not allowed for this endpoint',
-            'allowed_methods': e.valid_methods
-        }), 405
-    
-    # For regular page requests, show a custom error page
-    return render_template('errors/405.html', 
-                          allowed_methods=e.valid_methods), 405
-
-# Register error handlers for common HTTP errors
-@app.errorhandler(400)
-def bad_request(e):
-    """Handle Bad Request errors."""
-    app.logger.error(f"Bad Request error: {request.method} {request.path}")
-    if request.path.startswith('/api/'):
-        return jsonify({'error': 'Bad Request', 'message': str(e)}), 400
-    flash('Invalid request. Please try again.', 'danger')
-    return redirect(url_for('index'))
+    return _json_response(status)
 
-@app.errorhandler(404)
-def page_not_found(e):
-    """Handle Page Not Found errors."""
-    app.logger.error(f"Page Not Found: {request.method} {request.path}")
-    
-    # Check if this is an Edge browser
-    is_edge = session.get('is_edge_browser', False)
-    
-    # For Edge browser, suppress the error message
-    if is_edge:
+# Register the API blueprint now that its routes are defined
+app.register_blueprint(api_bp)
+
+# Error titles used for the four handled HTTP codes
+_ERROR_TITLES = {
+    400: 'Bad Request error',
+    404: 'Page Not Found',
+    405: 'Method Not Allowed error',
+    500: 'Internal Server Error',
+}
+
+def _handle_http_error(e):
+    """Shared handler for 400/404/405/500 errors.
+
+    All four handlers followed the same shape - log, JSON for API requests,
+    flash + redirect (or error page) otherwise - so a single dispatcher
+    replaces the near-identical functions.
+    """
+    # Non-HTTP exceptions routed to the 500 handler can carry an unrelated
+    # 'code' attribute (e.g. pymongo's OperationFailure.code); treat anything
+    # we don't have a title for as a 500 instead of crashing the handler.
+    code = getattr(e, 'code', 500)
+    if code not in _ERROR_TITLES:
+        code = 500
+    app.logger.error(f"{_ERROR_TITLES[code]}: {request.method} {request.path}")
+    if code == 500:
+        app.logger.exception("Exception details")
+
+    # For Edge browser, suppress 404s entirely (common after failed redirects)
+    if code == 404 and session.get('is_edge_browser', False):
         logger.info("Suppressing 404 error for Edge browser")
-        # If logged in, go to humanize page
-        if 'user_id' in session:
-            return redirect(url_for('humanize'))
-        # Otherwise go to home without error
-        return redirect(url_for('index'))
-        
-    # For API requests
-    if request.path.startswith('/api/'):
-        return jsonify({'error': 'Not Found', 'message': 'The requested resource was not found'}), 404
-    
-    # For logged-in users, redirect to humanize without flash message
-    if 'user_id' in session:
-        return redirect(url_for('humanize'))
-    
-    # For regular users, show error message
-    flash('The page you requested was not found.', 'warning')
-    return redirect(url_for('index'))
+        # If logged in, go to humanize page; otherwise home without error
+        return redirect(url_for('humanize' if g.get('user_id') else 'index'))
 
-@app.errorhandler(500)
-def internal_server_error(e):
-    """Handle Internal Server Error."""
-    app.logger.error(f"Internal Server Error: {request.method} {request.path}")
-    app.logger.exception("Exception details")
-    if request.path.startswith('/api/'):
+    # API requests get a JSON error body
+    if _is_api_request():
+        if code == 400:
+            return jsonify({'error': 'Bad Request', 'message': str(e)}), 400
+        if code == 404:
+            return jsonify({'error': 'Not Found', 'message': 'The requested resource was not found'}), 404
+        if code == 405:
+            return jsonify({
+                'error': 'Method not allowed',
+                'message': f'The method {request.method} is not allowed for this endpoint',
+                'allowed_methods': e.valid_methods
+            }), 405
         return jsonify({'error': 'Internal Server Error', 'message': 'An unexpected error occurred'}), 500
-    flash('An unexpected error occurred. Please try again later.', 'danger')
+
+    # Page requests
+    if code == 405:
+        # Show a custom error page
+        return render_template('errors/405.html',
+                              allowed_methods=e.valid_methods), 405
+
+    if code == 404:
+        # For logged-in users, redirect to humanize without flash message
+        # (g.get: errors raised before the before_request hooks skip the snapshot)
+        if g.get('user_id'):
+            return redirect(url_for('humanize'))
+        flash('The page you requested was not found.', 'warning')
+    elif code == 400:
+        flash('Invalid request. Please try again.', 'danger')
+    else:
+        flash('An unexpected error occurred. Please try again later.', 'danger')
     return redirect(url_for('index'))
 
+# Register the shared handler for common HTTP errors
+for _code in (400, 404, 405, 500):
+    app.register_error_handler(_code, _handle_http_error)
+
 if __name__ == '__main__':
-    # Run the Flask app
+    # Run the Flask dev server (production uses gunicorn via the Procfile).
+    # Debug/reloader only when FLASK_DEBUG is set - the dev server with
+    # debug=True is single-threaded and re-imports on every file change.
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=bool(os.environ.get('FLASK_DEBUG')))
@@ -4,6 +4,7 @@ Handles user authentication, JWT token generation/validation,
 and user session management
 """
 
+import hmac
 import os
 import jwt
 import datetime
@@ -82,7 +83,8 @@ def login_required_api(f):
     """Decorator for Flask route that requires login"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        if 'user_id' not in session:
+        # Single session lookup instead of __contains__ + later reads
+        if session.get('user_id') is None:
             return jsonify({'message': 'Login required'}), 401
         return f(*args, **kwargs)
     return decorated
@@ -145,8 +147,12 @@ def authenticate_user(username, password):
                 'account_type': user_data['plan']
             }
     else:
-        # Plain text password (only for development!)
-        if user_data['password'] == password:
+        # Plain text password (only for development!) - compared in constant
+        # time so the check doesn't leak a prefix-match timing signal
+        if hmac.compare_digest(user_data['password'].encode('utf-8'),
+                               password.encode('utf-8')):
+            # Upgrade the stored credential to a hash on successful login
+            users_db[username]['password'] = generate_password_hash(password)
             return {
                 'user_id': username,
                 'username': username,
@@ -27,15 +27,38 @@ logger = logging.getLogger(__name__)
 # OAuth client setup
 client = WebApplicationClient(GOOGLE_CLIENT_ID)
 
+# Shared session for the Google endpoints - a login makes two or three
+# HTTPS calls (token exchange, userinfo, sometimes discovery) and keep-alive
+# saves the TLS handshake on each after the first
+_session = requests.Session()
+
+# Google's endpoint configuration is effectively static, but it was re-fetched
+# over HTTPS on every login and again for every token/userinfo call. Cache it
+# for an hour so only the first request per process pays the round-trip.
+_provider_cfg_cache = {"value": None, "expires": 0}
+PROVIDER_CFG_TTL = 3600  # seconds
+
 def get_google_provider_cfg():
-    """Get Google's OAuth 2.0 endpoint configurations with retry logic"""
+    """Get Google's OAuth 2.0 endpoint configurations, cached with a 1h TTL"""
+    cached = _provider_cfg_cache["value"]
+    if cached and time.monotonic() < _provider_cfg_cache["expires"]:
+        return cached
+
+    cfg = _fetch_google_provider_cfg()
+    if cfg:
+        _provider_cfg_cache["value"] = cfg
+        _provider_cfg_cache["expires"] = time.monotonic() + PROVIDER_CFG_TTL
+    return cfg
+
+def _fetch_google_provider_cfg():
+    """Fetch Google's OAuth 2.0 endpoint configurations with retry logic"""
     max_retries = 3
     retry_delay = 1  # seconds
-    
+
     for attempt in range(max_retries):
         try:
             logger.info(f"Fetching Google provider config (attempt {attempt+1}/{max_retries})")
-            response = requests.get(GOOGLE_DISCOVERY_URL, timeout=10)
+            response = _session.get(GOOGLE_DISCOVERY_URL, timeout=10)
             
             if response.status_code == 200:
                 logger.info("Successfully fetched Google provider config")
@@ -157,7 +180,7 @@ def get_google_tokens(code, redirect_uri=None):
             logger.info(f"Using client secret: {client_secret_log}")
             
             # Make the token request with timeout and better error handling
-            token_response = requests.post(
+            token_response = _session.post(
                 token_url,
                 headers=headers,
                 data=body,
@@ -210,7 +233,7 @@ def get_google_user_info(tokens):
             
             # Make a request to the userinfo endpoint
             uri, headers, body = client.add_token(userinfo_endpoint)
-            userinfo_response = requests.get(uri, headers=headers, data=body, timeout=10)
+            userinfo_response = _session.get(uri, headers=headers, data=body, timeout=10)
             
             # Check if user info request was successful
             if userinfo_response.status_code != 200: